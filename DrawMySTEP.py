@@ -8,37 +8,31 @@ Run:
     python DrawMySTEP.py
 """
 
+import multiprocessing
+import os
 import queue
-import sys
 import threading
-import traceback
+import time
 from pathlib import Path
 from tkinter import filedialog
 
 import customtkinter as ctk
 
-from step_laser.main import process_step_file
+from step_laser.batch_log import run_in_pool
+from step_laser.main import (
+    STEP_SUFFIXES, init_worker, process_step_file, split_output_collisions,
+)
 from dxf_min_bound.main import process_dxf
 
 
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
-
-# ---------------------------------------------------------------------------
-
-class QueueWriter:
-    """Redirects write() calls to a queue for thread-safe GUI log updates."""
-
-    def __init__(self, q: queue.Queue):
-        self.q = q
-
-    def write(self, text: str):
-        if text and text.strip():
-            self.q.put(("log", text.rstrip()))
-
-    def flush(self):
-        pass
+# Log queue polling intervals (ms); idle after this many seconds without logs
+POLL_ACTIVE_MS = 10
+POLL_RECENT_MS = 30
+POLL_IDLE_MS = 100
+POLL_IDLE_AFTER_S = 2.0
 
 
 # ---------------------------------------------------------------------------
@@ -47,23 +41,28 @@ class ConverterTab(ctk.CTkFrame):
     """
     Reusable tab widget shared by both tools.
 
-    process_fn     – callable(path: Path) -> None  (runs in a worker thread)
-    glob_pattern   – e.g. "*.step"
+    process_fn     – callable(path: Path) -> None  (runs in a worker process,
+                     so it must be a picklable module-level function)
+    suffixes       – file extensions to pick up, e.g. (".step", ".stp")
     exclude_suffix – skip files whose stem ends with this (e.g. "_converted")
+    split_collisions – optional callable(paths) -> (kept, [(skipped, kept_by)])
+                       dropping files whose outputs would overwrite another's
     file_types     – filedialog filetypes list
     button_label   – text on the action button
     """
 
-    def __init__(self, parent, *, process_fn, glob_pattern,
-                 exclude_suffix, file_types, button_label):
+    def __init__(self, parent, *, process_fn, suffixes,
+                 exclude_suffix, file_types, button_label, split_collisions=None):
         super().__init__(parent, fg_color="transparent")
         self.pack(fill="both", expand=True, padx=10, pady=10)
 
         self.process_fn = process_fn
-        self.glob_pattern = glob_pattern
+        self.suffixes = suffixes
         self.exclude_suffix = exclude_suffix
+        self.split_collisions = split_collisions
         self.file_types = file_types
         self._log_queue: queue.Queue = queue.Queue()
+        self._last_log_time = 0.0
 
         # --- Path row -------------------------------------------------------
         path_frame = ctk.CTkFrame(self, fg_color="transparent")
@@ -132,81 +131,96 @@ class ConverterTab(ctk.CTkFrame):
         if p.is_file():
             paths = [p]
         else:
-            paths = sorted(
-                (
-                    f for f in p.glob(self.glob_pattern)
-                    if self.exclude_suffix is None
-                    or not f.stem.endswith(self.exclude_suffix)
-                ),
-                key=lambda f: f.name.lower(),
-            )
+            # scandir yields names and file types without a stat per entry
+            with os.scandir(p) as it:
+                entries = [
+                    e for e in it
+                    if e.is_file() and e.name.lower().endswith(self.suffixes)
+                    and (self.exclude_suffix is None
+                         or not os.path.splitext(e.name)[0].endswith(self.exclude_suffix))
+                ]
+            entries.sort(key=lambda e: e.name.lower())
+            paths = [Path(e.path) for e in entries]
 
         if not paths:
             self._clear_log()
-            self._append_log(f"No {self.glob_pattern} files found in: {p}")
+            kinds = "/".join(self.suffixes)
+            self._append_log(f"No {kinds} files found in: {p}")
             self.status_var.set("No files to process.")
             return
 
         self._clear_log()
+        skipped = []
+        if self.split_collisions is not None:
+            paths, skipped = self.split_collisions(paths)
+            for s, owner in skipped:
+                self._append_log(f"Skipping {s.name}: same output names as {owner.name}\n")
+
         self._set_busy(True)
         self.status_var.set(f"Processing {len(paths)} file(s)…")
 
         thread = threading.Thread(
-            target=self._worker, args=(paths,), daemon=True
+            target=self._worker, args=(paths, len(skipped)), daemon=True
         )
         thread.start()
-        self.after(100, self._poll_queue)
+        self._last_log_time = time.monotonic()
+        self.after(POLL_ACTIVE_MS, self._poll_queue)
 
     # -----------------------------------------------------------------------
 
-    def _worker(self, paths: list):
-        original_stdout = sys.stdout
-        original_stderr = sys.stderr
-        writer = QueueWriter(self._log_queue)
-        sys.stdout = writer
-        sys.stderr = writer
+    def _worker(self, paths: list, skipped: int):
+        """Convert paths in parallel, one worker process per CPU."""
+        # Log lines are posted as they arrive, grouped under each file's header
+        workers = min(os.cpu_count() or 1, len(paths))
+        result = run_in_pool(
+            self.process_fn, paths, workers,
+            write=lambda line: self._log_queue.put(("log", line)),
+            initializer=init_worker,
+        )
 
-        success = 0
-        total = len(paths)
-        try:
-            for i, p in enumerate(paths, 1):
-                self._log_queue.put(("log", f"[{i}/{total}] Processing: {p.name}"))
-                try:
-                    self.process_fn(p)
-                    success += 1
-                    self._log_queue.put(("log", "  Done.\n"))
-                except Exception as e:
-                    self._log_queue.put(("log", f"  ERROR: {e}"))
-                    self._log_queue.put(("log", traceback.format_exc()))
-                    self._log_queue.put(("log", ""))
-        finally:
-            sys.stdout = original_stdout
-            sys.stderr = original_stderr
-
-        self._log_queue.put(("done", success, total))
+        # Skipped files count against the total, so the status flags them
+        self._log_queue.put(("done", result.success, len(paths) + skipped))
 
     # -----------------------------------------------------------------------
 
     def _poll_queue(self):
+        # Records arrive one line per item again; insert each poll's lines
+        # into the textbox in one go
+        lines = []
+        done = None
         try:
-            while True:
+            while done is None:
                 item = self._log_queue.get_nowait()
                 if item[0] == "log":
-                    self._append_log(item[1])
+                    lines.append(item[1])
                 elif item[0] == "done":
-                    _, success, total = item
-                    self._set_busy(False)
-                    if success == total:
-                        self.status_var.set(f"✓ {success}/{total} completed.")
-                    else:
-                        self.status_var.set(
-                            f"⚠  {success}/{total} completed — see log for errors."
-                        )
-                    return
+                    done = item
         except queue.Empty:
             pass
 
-        self.after(100, self._poll_queue)
+        if lines:
+            self._append_log("\n".join(lines))
+        if done is not None:
+            _, success, total = done
+            self._set_busy(False)
+            if success == total:
+                self.status_var.set(f"✓ {success}/{total} completed.")
+            else:
+                self.status_var.set(
+                    f"⚠  {success}/{total} completed — see log for errors."
+                )
+            return
+
+        # Poll fast while records are flowing, back off once the log is quiet
+        now = time.monotonic()
+        if lines:
+            self._last_log_time = now
+            delay = POLL_ACTIVE_MS
+        elif now - self._last_log_time > POLL_IDLE_AFTER_S:
+            delay = POLL_IDLE_MS
+        else:
+            delay = POLL_RECENT_MS
+        self.after(delay, self._poll_queue)
 
     # -----------------------------------------------------------------------
 
@@ -243,16 +257,18 @@ class App(ctk.CTk):
         ConverterTab(
             tabs.tab("STEP → DXF / SVG / PDF"),
             process_fn=process_step_file,
-            glob_pattern="*.step",
+            suffixes=STEP_SUFFIXES,
             exclude_suffix=None,
-            file_types=[("STEP files", "*.step"), ("All files", "*.*")],
+            file_types=[("STEP files", " ".join("*" + s for s in STEP_SUFFIXES)),
+                        ("All files", "*.*")],
             button_label="Convert All  →  DXF / SVG / PDF",
+            split_collisions=split_output_collisions,
         )
 
         ConverterTab(
             tabs.tab("DXF Rotator"),
             process_fn=process_dxf,
-            glob_pattern="*.dxf",
+            suffixes=(".dxf",),
             exclude_suffix="_rotated",
             file_types=[("DXF files", "*.dxf"), ("All files", "*.*")],
             button_label="Rotate to Horizontal",
@@ -260,4 +276,5 @@ class App(ctk.CTk):
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # required for worker processes in the .exe
     App().mainloop()
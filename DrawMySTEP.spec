@@ -77,6 +77,7 @@ a = Analysis(
             "step_laser.projection",
             "step_laser.optimizer",
             "step_laser.exporters",
+            "step_laser.exporters.atomic",
             "step_laser.exporters.dxf_exporter",
             "step_laser.exporters.svg_exporter",
             "step_laser.exporters.pdf_exporter",
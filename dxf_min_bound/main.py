@@ -2,38 +2,54 @@
 dxf-min-bound: Rotate DXF files to minimize axis-aligned bounding box area.
 
 Usage:
-    python -m dxf_min_bound.main <folder_path>
+    python -m dxf_min_bound.main <folder_path> [--jobs N]
 
 Scans <folder_path> for .dxf files, rotates each for minimum bounding box,
 and writes results to an output_MM-DD-YYYY subfolder.
 """
+import logging
 import math
+import os
 import sys
-import traceback
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 import click
 import ezdxf
-from ezdxf import bbox as ezdxf_bbox
+from ezdxf.math import bulge_to_arc
 import numpy as np
-from shapely.geometry import MultiPoint
+import shapely
 
+from step_laser.batch_log import (
+    FileLogGrouper, FileLogHandler, error_info, log_to, run_in_pool,
+)
+from step_laser.exporters.atomic import temp_sibling
 
-def _sample_entity_points(entity, n: int = 64) -> List[Tuple[float, float]]:
-    """Extract representative 2D points from a DXF entity."""
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def _unit_circle(n: int) -> np.ndarray:
+    """Return n evenly spaced (cos, sin) unit-circle samples, cached per n."""
+    a = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    lut = np.column_stack([np.cos(a), np.sin(a)])
+    lut.flags.writeable = False
+    return lut
+
+
+def _sample_entity_points(entity, n: int = 64) -> np.ndarray:
+    """Extract representative 2D points from a DXF entity as an (k, 2) array."""
     dxftype = entity.dxftype()
-    pts: List[Tuple[float, float]] = []
 
     if dxftype == "LINE":
-        pts.append((entity.dxf.start[0], entity.dxf.start[1]))
-        pts.append((entity.dxf.end[0], entity.dxf.end[1]))
+        start, end = entity.dxf.start, entity.dxf.end
+        return np.array([[start[0], start[1]], [end[0], end[1]]])
 
     elif dxftype == "CIRCLE":
         cx, cy, r = entity.dxf.center[0], entity.dxf.center[1], entity.dxf.radius
-        for i in range(n):
-            a = 2 * math.pi * i / n
-            pts.append((cx + r * math.cos(a), cy + r * math.sin(a)))
+        return (cx, cy) + r * _unit_circle(n)
 
     elif dxftype == "ARC":
         cx, cy, r = entity.dxf.center[0], entity.dxf.center[1], entity.dxf.radius
@@ -43,139 +59,291 @@ def _sample_entity_points(entity, n: int = 64) -> List[Tuple[float, float]]:
         if span == 0:
             span = 360.0
         steps = max(8, int(span / 360 * n))
-        for i in range(steps + 1):
-            a = math.radians(sa + span * i / steps)
-            pts.append((cx + r * math.cos(a), cy + r * math.sin(a)))
+        a0 = math.radians(sa)
+        step = math.radians(span) / steps
+        a = a0 + step * np.arange(steps + 1)
+        pts = np.empty((steps + 1, 2))
+        pts[:, 0] = cx + r * np.cos(a)
+        pts[:, 1] = cy + r * np.sin(a)
+        return pts
 
     elif dxftype == "LWPOLYLINE":
-        pts.extend((x, y) for x, y in entity.get_points(format="xy"))
+        return np.asarray(
+            list(entity.get_points(format="xy")), dtype=np.float64
+        ).reshape(-1, 2)
+
+    return np.empty((0, 2))
 
-    return pts
 
+def _find_optimal_angle(all_pts: np.ndarray) -> float:
+    """
+    Return the hull edge angle (degrees) that minimizes bounding box area.
 
-def _find_optimal_angle(all_pts: List[Tuple[float, float]]) -> float:
-    """Return the MRR edge angle (degrees) that minimizes bounding box area."""
+    The minimum-area rectangle always has a side collinear with a convex hull
+    edge (rotating calipers), so only the hull edge orientations are tried.
+    """
     if len(all_pts) < 3:
         return 0.0
-    hull = MultiPoint(all_pts).convex_hull
-    mrr = hull.minimum_rotated_rectangle
-    coords = list(mrr.exterior.coords)
-    edge_vec = np.array(coords[1]) - np.array(coords[0])
-    return math.degrees(math.atan2(edge_vec[1], edge_vec[0]))
-
+    hull = shapely.convex_hull(shapely.multipoints(all_pts))
+    h = shapely.get_coordinates(hull)
 
-def _rotate_pt(x: float, y: float, cos_a: float, sin_a: float) -> Tuple[float, float]:
-    return (x * cos_a - y * sin_a, x * sin_a + y * cos_a)
+    edges = np.diff(np.vstack([h, h[:1]]), axis=0)
+    edges = edges[np.hypot(edges[:, 0], edges[:, 1]) > 1e-12]
+    if not len(edges):
+        return 0.0
+    theta = np.arctan2(edges[:, 1], edges[:, 0])
+    cos_t, sin_t = np.cos(theta), np.sin(theta)
+
+    # Hull points projected onto each edge-aligned frame: (n_pts, n_edges)
+    u = h @ np.vstack([cos_t, sin_t])
+    v = h @ np.vstack([-sin_t, cos_t])
+    areas = np.ptp(u, axis=0) * np.ptp(v, axis=0)
+    return math.degrees(theta[int(np.argmin(areas))])
+
+
+def _arc_extents(cx: float, cy: float, r: float,
+                 start_deg: float, end_deg: float) -> Tuple[float, float, float, float]:
+    """Return the tight (xmin, ymin, xmax, ymax) of a CCW arc."""
+    span = (end_deg - start_deg) % 360.0
+    if span == 0:
+        span = 360.0
+    angles = [start_deg, start_deg + span]
+    # Quadrant points (0, 90, 180, 270 degrees) swept by the arc
+    q = math.ceil(start_deg / 90.0) * 90.0
+    while q < start_deg + span:
+        angles.append(q)
+        q += 90.0
+    xs = [cx + r * math.cos(math.radians(a)) for a in angles]
+    ys = [cy + r * math.sin(math.radians(a)) for a in angles]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _lwpolyline_extents(pts: np.ndarray, closed: bool) -> Tuple[float, float, float, float]:
+    """Return the tight (xmin, ymin, xmax, ymax) of an (n, 3) "xyb" point array."""
+    xmin, ymin = pts[:, :2].min(axis=0)
+    xmax, ymax = pts[:, :2].max(axis=0)
+    n = len(pts)
+    for i in np.flatnonzero(pts[:, 2]):
+        if i == n - 1 and not closed:
+            continue
+        j = (i + 1) % n
+        center, sa, ea, r = bulge_to_arc(pts[i, :2], pts[j, :2], pts[i, 2])
+        axmin, aymin, axmax, aymax = _arc_extents(
+            center.x, center.y, r, math.degrees(sa), math.degrees(ea)
+        )
+        xmin, ymin = min(xmin, axmin), min(ymin, aymin)
+        xmax, ymax = max(xmax, axmax), max(ymax, aymax)
+    return xmin, ymin, xmax, ymax
 
 
 def _apply_rotation(msp, angle_deg: float) -> Tuple[float, float]:
     """
     Rotate all entities in msp by angle_deg (in-place), translate so the
     minimum corner is at (0, 0), and return (bbox_w, bbox_h).
+
+    Coordinates are gathered per entity type into arrays and rotated with
+    one matmul each; the extents are known before anything is written
+    back, so every entity is updated exactly once and no separate bbox
+    traversal is needed.
     """
     rad = math.radians(angle_deg)
     cos_a, sin_a = math.cos(rad), math.sin(rad)
+    rot = np.array([[cos_a, -sin_a], [sin_a, cos_a]])
 
+    lines, circles, arcs, polylines = [], [], [], []
     for entity in msp:
         dxftype = entity.dxftype()
-
         if dxftype == "LINE":
-            sx, sy = _rotate_pt(entity.dxf.start[0], entity.dxf.start[1], cos_a, sin_a)
-            ex, ey = _rotate_pt(entity.dxf.end[0], entity.dxf.end[1], cos_a, sin_a)
-            entity.dxf.start = (sx, sy, 0)
-            entity.dxf.end = (ex, ey, 0)
-
-        elif dxftype in ("CIRCLE", "ARC"):
-            cx, cy = _rotate_pt(entity.dxf.center[0], entity.dxf.center[1], cos_a, sin_a)
-            entity.dxf.center = (cx, cy, 0)
-            if dxftype == "ARC":
-                # Rotate both angles by the same amount
-                entity.dxf.start_angle = (entity.dxf.start_angle + angle_deg) % 360
-                entity.dxf.end_angle = (entity.dxf.end_angle + angle_deg) % 360
-
-        elif dxftype == "LWPOLYLINE":
-            new_pts = []
-            for pt in entity.get_points(format="xyb"):
-                rx, ry = _rotate_pt(pt[0], pt[1], cos_a, sin_a)
-                new_pts.append((rx, ry, pt[2]))  # bulge is rotation-invariant
-            entity.set_points(new_pts, format="xyb")
-
-    # Translate so min corner sits at (0, 0)
-    extents = ezdxf_bbox.extents(msp)
-    ox, oy = extents.extmin[0], extents.extmin[1]
-
-    for entity in msp:
-        dxftype = entity.dxftype()
-        if dxftype == "LINE":
-            entity.dxf.start = (entity.dxf.start[0] - ox, entity.dxf.start[1] - oy, 0)
-            entity.dxf.end = (entity.dxf.end[0] - ox, entity.dxf.end[1] - oy, 0)
-        elif dxftype in ("CIRCLE", "ARC"):
-            entity.dxf.center = (entity.dxf.center[0] - ox, entity.dxf.center[1] - oy, 0)
+            lines.append(entity)
+        elif dxftype == "CIRCLE":
+            circles.append(entity)
+        elif dxftype == "ARC":
+            arcs.append(entity)
         elif dxftype == "LWPOLYLINE":
-            new_pts = [(pt[0] - ox, pt[1] - oy, pt[2])
-                       for pt in entity.get_points(format="xyb")]
-            entity.set_points(new_pts, format="xyb")
-
-    extents = ezdxf_bbox.extents(msp)
-    return extents.extmax[0], extents.extmax[1]
-
-
-def process_dxf(dxf_path: Path) -> None:
-    """Rotate one DXF file to its minimum bounding box and write alongside it."""
+            polylines.append(entity)
+
+    # (2L, 2): start and end points interleaved
+    line_xy = np.array(
+        [(e.dxf.start[0], e.dxf.start[1], e.dxf.end[0], e.dxf.end[1]) for e in lines]
+    ).reshape(-1, 2) @ rot.T
+    circ_xy = np.array(
+        [(e.dxf.center[0], e.dxf.center[1]) for e in circles]
+    ).reshape(-1, 2) @ rot.T
+    circ_r = np.array([e.dxf.radius for e in circles]).reshape(-1, 1)
+    arc_xy = np.array(
+        [(e.dxf.center[0], e.dxf.center[1]) for e in arcs]
+    ).reshape(-1, 2) @ rot.T
+    # Rotate both angles by the same amount
+    arc_angles = [
+        ((e.dxf.start_angle + angle_deg) % 360, (e.dxf.end_angle + angle_deg) % 360)
+        for e in arcs
+    ]
+    # All polyline vertices in one contiguous (P, 3) array, split back into
+    # per-entity views after a single rotation
+    poly_raw = [e.get_points(format="xyb") for e in polylines]
+    poly_all = np.array(
+        [pt for pts in poly_raw for pt in pts], dtype=np.float64
+    ).reshape(-1, 3)
+    poly_all[:, :2] = poly_all[:, :2] @ rot.T  # bulge is rotation-invariant
+    poly_pts = np.split(poly_all, np.cumsum([len(pts) for pts in poly_raw])[:-1])
+
+    # Per-entity (xmin, ymin, xmax, ymax) rows; the file's extents follow
+    boxes = [
+        np.hstack([np.minimum(line_xy[0::2], line_xy[1::2]),
+                   np.maximum(line_xy[0::2], line_xy[1::2])]),
+        np.hstack([circ_xy - circ_r, circ_xy + circ_r]),
+    ]
+    boxes += [
+        _arc_extents(cx, cy, e.dxf.radius, sa, ea)
+        for e, (cx, cy), (sa, ea) in zip(arcs, arc_xy.tolist(), arc_angles)
+    ]
+    boxes += [
+        _lwpolyline_extents(pts, e.closed)
+        for e, pts in zip(polylines, poly_pts) if len(pts)
+    ]
+    boxes = np.vstack(boxes)
+    if len(boxes):
+        origin = boxes[:, :2].min(axis=0)
+        bbox_w, bbox_h = boxes[:, 2:].max(axis=0) - origin
+    else:
+        origin = np.zeros(2)
+        bbox_w = bbox_h = 0.0
+
+    # Write back, translated so min corner sits at (0, 0)
+    for e, (sx, sy, ex, ey) in zip(lines, (line_xy - origin).reshape(-1, 4).tolist()):
+        e.dxf.start = (sx, sy, 0)
+        e.dxf.end = (ex, ey, 0)
+    for e, (cx, cy) in zip(circles, (circ_xy - origin).tolist()):
+        e.dxf.center = (cx, cy, 0)
+    for e, (cx, cy), (sa, ea) in zip(arcs, (arc_xy - origin).tolist(), arc_angles):
+        e.dxf.center = (cx, cy, 0)
+        e.dxf.start_angle = sa
+        e.dxf.end_angle = ea
+    poly_all[:, :2] -= origin  # in place, so the per-entity views follow
+    for e, pts in zip(polylines, poly_pts):
+        e.set_points(pts.tolist(), format="xyb")
+
+    return float(bbox_w), float(bbox_h)
+
+
+def _rotate_dxf(dxf_path: Path):
+    """Rotate one DXF document in memory; return (doc, out_path) for saving."""
     doc = ezdxf.readfile(str(dxf_path))
     msp = doc.modelspace()
 
-    all_pts: List[Tuple[float, float]] = []
-    for entity in msp:
-        all_pts.extend(_sample_entity_points(entity))
+    sampled = [_sample_entity_points(entity) for entity in msp]
+    all_pts = np.vstack(sampled) if sampled else np.empty((0, 2))
 
-    if not all_pts:
+    if not len(all_pts):
         raise ValueError("No geometry found in DXF")
 
     mrr_angle = _find_optimal_angle(all_pts)
     angle_deg = -mrr_angle  # negate to align MRR edge with X-axis
-    print(f"  Rotation: {angle_deg:.1f}\u00b0")
+    logger.info(f"  Rotation: {angle_deg:.1f}\u00b0")
 
     bbox_w, bbox_h = _apply_rotation(msp, angle_deg)
-    print(f"  Bounding box: {bbox_w:.3f} \u00d7 {bbox_h:.3f}")
+    logger.info(f"  Bounding box: {bbox_w:.3f} \u00d7 {bbox_h:.3f}")
 
     stem = dxf_path.stem.replace(" ", "_") + "_rotated"
-    out_path = dxf_path.parent / f"{stem}.dxf"
-    doc.saveas(str(out_path))
-    print(f"  Saved: {out_path.name}")
+    return doc, dxf_path.parent / f"{stem}.dxf"
+
+
+def _save_dxf(doc, out_path: Path) -> None:
+    """Save doc to out_path atomically."""
+    # Save to a sibling temp file first so a failed write never leaves a
+    # truncated output behind
+    tmp_path = temp_sibling(out_path)
+    try:
+        doc.saveas(str(tmp_path))
+        os.replace(tmp_path, out_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    logger.info(f"  Saved: {out_path.name}")
+
+
+def process_dxf(dxf_path: Path) -> None:
+    """Rotate one DXF file to its minimum bounding box and write alongside it."""
+    _save_dxf(*_rotate_dxf(dxf_path))
+
+
+def _save_logged(handler: FileLogHandler, index: int, doc, out_path: Path) -> None:
+    """Saver-thread task: save doc with its records tagged as file index."""
+    with handler.file(index):
+        try:
+            _save_dxf(doc, out_path)
+            error = None
+        except Exception as e:
+            error = error_info(e)
+    handler.sink(("end", index, error))
+
+
+def _run_serial(dxf_files: List[Path], write) -> FileLogGrouper:
+    """
+    Process files in this process, writing each file's log as one block.
+
+    A single-thread saver writes each document while the next file is being
+    rotated; at most one save is pending, so finished documents never pile
+    up in memory.
+    """
+    grouper = FileLogGrouper(dxf_files, write)
+    handler = log_to(grouper.handle)
+    with ThreadPoolExecutor(max_workers=1) as saver:
+        pending = None
+        for i, dxf_path in enumerate(dxf_files):
+            handler.sink(("start", i))
+            with handler.file(i):
+                try:
+                    rotated = _rotate_dxf(dxf_path)
+                except Exception as e:
+                    rotated = None
+                    handler.sink(("end", i, error_info(e)))
+            if pending is not None:
+                pending.result()
+                pending = None
+            if rotated is not None:
+                pending = saver.submit(_save_logged, handler, i, *rotated)
+        if pending is not None:
+            pending.result()
+    return grouper
+
+
+def _configure_logging() -> None:
+    """Print log records to stdout."""
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
 
 
 @click.command()
 @click.argument("folder", type=click.Path(exists=True, file_okay=False))
-def main(folder: str) -> None:
+@click.option("--jobs", "-j", type=click.IntRange(min=1), default=None,
+              help="Maximum files processed in parallel (default: CPU count).")
+def main(folder: str, jobs: Optional[int]) -> None:
     """Rotate DXF files in FOLDER to minimize bounding box area."""
+    _configure_logging()
     folder_path = Path(folder).resolve()
 
     # Skip files that are already rotated outputs
-    dxf_files = sorted(
-        (p for p in folder_path.glob("*.dxf") if not p.stem.endswith("_rotated")),
-        key=lambda p: p.name.lower(),
-    )
+    with os.scandir(folder_path) as it:
+        entries = [
+            e for e in it
+            if e.is_file() and e.name.lower().endswith(".dxf")
+            and not e.name[:-4].endswith("_rotated")
+        ]
+    entries.sort(key=lambda e: e.name.lower())
+    dxf_files = [Path(e.path) for e in entries]
     if not dxf_files:
         click.echo(f"No .dxf files found in {folder_path}")
         sys.exit(1)
 
     click.echo(f"Found {len(dxf_files)} DXF file(s) in: {folder_path.name}\n")
 
-    success = 0
-    errors = []
-
-    for i, dxf_path in enumerate(dxf_files, 1):
-        click.echo(f"[{i}/{len(dxf_files)}] {dxf_path.name}")
-        try:
-            process_dxf(dxf_path)
-            success += 1
-            click.echo()
-        except Exception as e:
-            errors.append((dxf_path.name, str(e)))
-            click.echo(f"  ERROR: {e}")
-            traceback.print_exc()
-            click.echo()
+    # Each file's log is printed as one block under its header (see batch_log)
+    workers = min(jobs or os.cpu_count() or 1, len(dxf_files))
+    if workers == 1:
+        result = _run_serial(dxf_files, click.echo)
+    else:
+        result = run_in_pool(process_dxf, dxf_files, workers, click.echo)
+    success, errors = result.success, result.errors
 
     click.echo("=" * 50)
     click.echo(f"Processed: {success}/{len(dxf_files)} files successfully")
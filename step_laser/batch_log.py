@@ -0,0 +1,202 @@
+"""
+Per-file log blocks for batch runs.
+
+Files are converted concurrently, but each file's log should read as one
+block under its "[i/N] Processing: name" header. Workers tag every record
+with the index of the file being processed (FileLogHandler) and pass it to
+a sink; in the parent, FileLogGrouper writes one file's lines as they
+arrive and holds the others' until that file is done.
+
+Events are plain tuples so they can cross a multiprocessing queue:
+    ("start", index)
+    ("log", index, line)
+    ("end", index, error)    error is None or (message, traceback)
+"""
+import logging
+import multiprocessing
+import threading
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# (message, formatted traceback): plain strings, since OCC exceptions do
+# not always survive pickling
+Error = Tuple[str, str]
+
+
+def error_info(e: BaseException) -> Error:
+    """Return (message, traceback) for e as plain strings."""
+    return str(e), "".join(traceback.format_exception(type(e), e, e.__traceback__))
+
+
+class FileLogHandler(logging.Handler):
+    """
+    Tags each record with the file its thread is working on and sinks it.
+
+    Tags are per thread, so a saver thread and the main thread can work on
+    different files at once.
+    """
+
+    def __init__(self, sink: Callable[[tuple], None]):
+        super().__init__()
+        self.sink = sink
+        self._local = threading.local()
+
+    def emit(self, record):
+        index = getattr(self._local, "index", None)
+        if index is not None:
+            self.sink(("log", index, self.format(record)))
+
+    @contextmanager
+    def file(self, index: int) -> Iterator[None]:
+        """Tag this thread's records inside the block as file index."""
+        self._local.index = index
+        try:
+            yield
+        finally:
+            self._local.index = None
+
+    def run(self, process_fn, index: int, path: Path) -> None:
+        """Run process_fn(path) as file index, between its start and end events."""
+        self.sink(("start", index))
+        with self.file(index):
+            try:
+                process_fn(path)
+                error = None
+            except Exception as e:
+                error = error_info(e)
+        self.sink(("end", index, error))
+
+
+_handler: Optional[FileLogHandler] = None
+
+
+def log_to(sink: Callable[[tuple], None]) -> FileLogHandler:
+    """Route all log records through a FileLogHandler feeding sink."""
+    global _handler
+    _handler = FileLogHandler(sink)
+    # force: replaces the stdout handler, which forked workers also inherit
+    logging.basicConfig(level=logging.INFO, format="%(message)s", handlers=[_handler],
+                        force=True)
+    return _handler
+
+
+def init_worker(events) -> None:
+    """Pool initializer: send tagged records to the parent over the events queue."""
+    log_to(events.put)
+
+
+def run_logged(process_fn, index: int, path: Path) -> None:
+    """Pool task: run process_fn(path) with its records tagged as file index."""
+    _handler.run(process_fn, index, path)
+
+
+class FileLogGrouper:
+    """
+    Writes the events of concurrently processed files as one block per file.
+
+    The file being shown streams its lines as they arrive; files started
+    meanwhile are held and shown in start order once it ends. With one file
+    at a time, every line is written live.
+    """
+
+    def __init__(self, paths: List[Path], write: Callable[[str], None]):
+        self.paths = paths
+        self.write = write
+        self.success = 0
+        self.errors: List[Tuple[str, str]] = []  # (file name, message)
+        self._shown = 0
+        self._current: Optional[int] = None
+        self._held: Dict[int, List[str]] = {}  # started, not yet shown
+        self._ended: Dict[int, Optional[Error]] = {}  # held and already done
+        self._done = set()
+        # The serial DXF runner feeds events from two threads
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return len(self._done) == len(self.paths)
+
+    def handle(self, event: tuple) -> None:
+        kind, index = event[0], event[1]
+        with self._lock:
+            # A worker that dies after its end event is reported twice
+            if index in self._done or index in self._ended:
+                return
+            if kind == "start":
+                if self._current is None:
+                    self._show(index, [])
+                else:
+                    self._held.setdefault(index, [])
+            elif kind == "log":
+                if index == self._current:
+                    self.write(event[2])
+                else:
+                    self._held.setdefault(index, []).append(event[2])
+            else:
+                self._end(index, event[2])
+
+    def _show(self, index: int, lines: List[str]) -> None:
+        self._current = index
+        self._shown += 1
+        self.write(f"[{self._shown}/{len(self.paths)}] Processing: {self.paths[index].name}")
+        for line in lines:
+            self.write(line)
+
+    def _end(self, index: int, error: Optional[Error]) -> None:
+        if self._current is None:
+            self._show(index, self._held.pop(index, []))
+        if index != self._current:
+            self._held.setdefault(index, [])
+            self._ended[index] = error
+            return
+        self._finish(index, error)
+        # dicts keep insertion order, so held files come out in start order
+        while self._held:
+            index = next(iter(self._held))
+            self._show(index, self._held.pop(index))
+            if index not in self._ended:
+                break
+            self._finish(index, self._ended.pop(index))
+
+    def _finish(self, index: int, error: Optional[Error]) -> None:
+        self._done.add(index)
+        self._current = None
+        if error is None:
+            self.success += 1
+            self.write("  Done.\n")
+        else:
+            message, tb = error
+            self.errors.append((self.paths[index].name, message))
+            self.write(f"  ERROR: {message}")
+            self.write(tb)
+
+
+def _report_crash(events, index: int, future) -> None:
+    """Done callback: a task only raises if its worker died before its end event."""
+    e = future.exception()
+    if e is not None:
+        events.put(("end", index, error_info(e)))
+
+
+def run_in_pool(process_fn, paths: List[Path], workers: int,
+                write: Callable[[str], None], initializer=init_worker) -> FileLogGrouper:
+    """
+    Run process_fn over paths in a process pool, writing each file's log block.
+
+    initializer(events) runs in every worker and must end up calling
+    init_worker(events). Returns the grouper for its success count and errors.
+    """
+    grouper = FileLogGrouper(paths, write)
+    events = multiprocessing.Queue()
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer,
+                             initargs=(events,)) as pool:
+        for i, p in enumerate(paths):
+            future = pool.submit(run_logged, process_fn, i, p)
+            future.add_done_callback(partial(_report_crash, events, i))
+        while not grouper.finished:
+            grouper.handle(events.get())
+    return grouper
@@ -0,0 +1,42 @@
+"""
+Crash-safe output files.
+
+Exporters write to a sibling temp file and move it over the real output
+only once writing succeeded, so a failure mid-batch never leaves a
+truncated DXF/SVG/PDF behind.
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+# mkstemp creates files as 0600; outputs get the usual umask-based mode
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def temp_sibling(output_path: Path) -> Path:
+    """
+    Create an empty, uniquely named temp file next to output_path.
+
+    A fixed "<name>.tmp" would be shared by two writers of the same output,
+    and one writer's replace or cleanup would pull the other's file away.
+    """
+    fd, tmp = tempfile.mkstemp(dir=output_path.parent, prefix=output_path.name + ".",
+                               suffix=".tmp")
+    os.close(fd)  # writers reopen the path themselves
+    os.chmod(tmp, 0o666 & ~_UMASK)
+    return Path(tmp)
+
+
+@contextmanager
+def atomic_output(output_path: Path) -> Iterator[Path]:
+    """Yield a temp path next to output_path; replace output_path on success."""
+    tmp_path = temp_sibling(output_path)
+    try:
+        yield tmp_path
+        os.replace(tmp_path, output_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
@@ -8,6 +8,57 @@ import ezdxf
 
 from ..projection import Arc2D, Circle2D, Line2D, Polyline2D
 from ..optimizer import OptimizedProfile
+from .atomic import atomic_output
+
+
+def _emit_line(edge: Line2D, msp) -> None:
+    msp.add_line(
+        (edge.x1, edge.y1),
+        (edge.x2, edge.y2),
+    )
+
+
+def _emit_circle(edge: Circle2D, msp) -> None:
+    msp.add_circle(
+        (edge.cx, edge.cy),
+        edge.r,
+    )
+
+
+def _emit_arc(edge: Arc2D, msp) -> None:
+    # DXF arcs always go CCW from start_angle to end_angle.
+    end_angle = edge.start_deg + edge.sweep_deg
+    if edge.sweep_deg > 0:
+        # CCW: use directly
+        msp.add_arc(
+            center=(edge.cx, edge.cy),
+            radius=edge.r,
+            start_angle=edge.start_deg,
+            end_angle=end_angle,
+        )
+    else:
+        # CW: swap start/end so DXF draws it CCW the other way
+        msp.add_arc(
+            center=(edge.cx, edge.cy),
+            radius=edge.r,
+            start_angle=end_angle,
+            end_angle=edge.start_deg,
+        )
+
+
+def _emit_polyline(edge: Polyline2D, msp) -> None:
+    if len(edge.points) >= 2:
+        msp.add_lwpolyline(edge.points)
+
+
+# Keyed on the exact edge type: one dict lookup per edge instead of an
+# isinstance chain
+_DXF_EMITTERS = {
+    Line2D: _emit_line,
+    Circle2D: _emit_circle,
+    Arc2D: _emit_arc,
+    Polyline2D: _emit_polyline,
+}
 
 
 def export_dxf(profile: OptimizedProfile, output_path: Path) -> None:
@@ -17,41 +68,13 @@ def export_dxf(profile: OptimizedProfile, output_path: Path) -> None:
     msp = doc.modelspace()
 
     for edge in profile.edges:
-        if isinstance(edge, Line2D):
-            msp.add_line(
-                (edge.x1, edge.y1),
-                (edge.x2, edge.y2),
-            )
-        elif isinstance(edge, Circle2D):
-            msp.add_circle(
-                (edge.cx, edge.cy),
-                edge.r,
-            )
-        elif isinstance(edge, Arc2D):
-            # DXF arcs always go CCW from start_angle to end_angle.
-            end_angle = edge.start_deg + edge.sweep_deg
-            if edge.sweep_deg > 0:
-                # CCW: use directly
-                msp.add_arc(
-                    center=(edge.cx, edge.cy),
-                    radius=edge.r,
-                    start_angle=edge.start_deg,
-                    end_angle=end_angle,
-                )
-            else:
-                # CW: swap start/end so DXF draws it CCW the other way
-                msp.add_arc(
-                    center=(edge.cx, edge.cy),
-                    radius=edge.r,
-                    start_angle=end_angle,
-                    end_angle=edge.start_deg,
-                )
-        elif isinstance(edge, Polyline2D):
-            if len(edge.points) >= 2:
-                msp.add_lwpolyline(edge.points)
+        emit = _DXF_EMITTERS.get(type(edge))
+        if emit is not None:
+            emit(edge, msp)
 
     # Set extents
     doc.header["$EXTMIN"] = (0, 0, 0)
     doc.header["$EXTMAX"] = (profile.bbox_w, profile.bbox_h, 0)
 
-    doc.saveas(str(output_path))
+    with atomic_output(output_path) as tmp_path:
+        doc.saveas(str(tmp_path))
@@ -8,12 +8,14 @@ from __future__ import annotations
 import math
 from pathlib import Path
 
+import numpy as np
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
 from reportlab.pdfgen import canvas
 
 from ..projection import Arc2D, Circle2D, Line2D, Polyline2D
 from ..optimizer import OptimizedProfile
+from .atomic import atomic_output
 
 # Page layout constants (all in points; 1 inch = 72 points)
 PAGE_W, PAGE_H = letter  # 612 × 792 points (8.5" × 11")
@@ -25,6 +27,51 @@ DRAW_AREA_W = PAGE_W - 2 * MARGIN
 DRAW_AREA_H = PAGE_H - DRAW_AREA_Y - MARGIN
 
 
+def _draw_line(c: canvas.Canvas, edge: Line2D,
+               ox: float, oy: float, scale: float) -> None:
+    c.line(
+        ox + edge.x1 * scale, oy + edge.y1 * scale,
+        ox + edge.x2 * scale, oy + edge.y2 * scale,
+    )
+
+
+def _draw_circle(c: canvas.Canvas, edge: Circle2D,
+                 ox: float, oy: float, scale: float) -> None:
+    cx = ox + edge.cx * scale
+    cy = oy + edge.cy * scale
+    r = edge.r * scale
+    c.circle(cx, cy, r, stroke=1, fill=0)
+
+
+def _draw_arc(c: canvas.Canvas, edge: Arc2D,
+              ox: float, oy: float, scale: float) -> None:
+    cx = ox + edge.cx * scale
+    cy = oy + edge.cy * scale
+    r = edge.r * scale
+    # reportlab arc uses bounding box of the full circle
+    x1 = cx - r
+    y1 = cy - r
+    x2 = cx + r
+    y2 = cy + r
+    c.arc(x1, y1, x2, y2, startAng=edge.start_deg, extent=edge.sweep_deg)
+
+
+def _draw_polyline(c: canvas.Canvas, edge: Polyline2D,
+                   ox: float, oy: float, scale: float) -> None:
+    if len(edge.points) >= 2:
+        pts = np.asarray(edge.points, dtype=np.float64) * scale + (ox, oy)
+        # One c.lines() call with (x1, y1, x2, y2) per segment
+        c.lines(np.hstack([pts[:-1], pts[1:]]).tolist())
+
+
+_PDF_DRAWERS = {
+    Line2D: _draw_line,
+    Circle2D: _draw_circle,
+    Arc2D: _draw_arc,
+    Polyline2D: _draw_polyline,
+}
+
+
 def _draw_profile(c: canvas.Canvas, profile: OptimizedProfile,
                   ox: float, oy: float, scale: float) -> None:
     """Draw all edge primitives on the PDF canvas."""
@@ -32,37 +79,9 @@ def _draw_profile(c: canvas.Canvas, profile: OptimizedProfile,
     c.setLineWidth(0.5)
 
     for edge in profile.edges:
-        if isinstance(edge, Line2D):
-            c.line(
-                ox + edge.x1 * scale, oy + edge.y1 * scale,
-                ox + edge.x2 * scale, oy + edge.y2 * scale,
-            )
-
-        elif isinstance(edge, Circle2D):
-            cx = ox + edge.cx * scale
-            cy = oy + edge.cy * scale
-            r = edge.r * scale
-            c.circle(cx, cy, r, stroke=1, fill=0)
-
-        elif isinstance(edge, Arc2D):
-            cx = ox + edge.cx * scale
-            cy = oy + edge.cy * scale
-            r = edge.r * scale
-            # reportlab arc uses bounding box of the full circle
-            x1 = cx - r
-            y1 = cy - r
-            x2 = cx + r
-            y2 = cy + r
-            c.arc(x1, y1, x2, y2, startAng=edge.start_deg, extent=edge.sweep_deg)
-
-        elif isinstance(edge, Polyline2D):
-            if len(edge.points) >= 2:
-                path = c.beginPath()
-                px, py = edge.points[0]
-                path.moveTo(ox + px * scale, oy + py * scale)
-                for px, py in edge.points[1:]:
-                    path.lineTo(ox + px * scale, oy + py * scale)
-                c.drawPath(path, stroke=1, fill=0)
+        draw = _PDF_DRAWERS.get(type(edge))
+        if draw is not None:
+            draw(c, edge, ox, oy, scale)
 
 
 def _draw_dimensions(c: canvas.Canvas, profile: OptimizedProfile,
@@ -80,18 +99,22 @@ def _draw_dimensions(c: canvas.Canvas, profile: OptimizedProfile,
 
     # --- Width dimension (bottom) ---
     dy = oy - arrow_gap
-    # Line
-    c.line(ox, dy, ox + w_pts, dy)
-    # Left arrow
-    c.line(ox, dy, ox + arrow_size, dy + arrow_size / 2)
-    c.line(ox, dy, ox + arrow_size, dy - arrow_size / 2)
-    # Right arrow
-    c.line(ox + w_pts, dy, ox + w_pts - arrow_size, dy + arrow_size / 2)
-    c.line(ox + w_pts, dy, ox + w_pts - arrow_size, dy - arrow_size / 2)
+    c.lines([
+        # Line
+        (ox, dy, ox + w_pts, dy),
+        # Left arrow
+        (ox, dy, ox + arrow_size, dy + arrow_size / 2),
+        (ox, dy, ox + arrow_size, dy - arrow_size / 2),
+        # Right arrow
+        (ox + w_pts, dy, ox + w_pts - arrow_size, dy + arrow_size / 2),
+        (ox + w_pts, dy, ox + w_pts - arrow_size, dy - arrow_size / 2),
+    ])
     # Extension lines
     c.setDash(1, 2)
-    c.line(ox, oy, ox, dy - 4)
-    c.line(ox + w_pts, oy, ox + w_pts, dy - 4)
+    c.lines([
+        (ox, oy, ox, dy - 4),
+        (ox + w_pts, oy, ox + w_pts, dy - 4),
+    ])
     c.setDash()
     # Label
     label_w = f'{profile.bbox_w:.3f}"'
@@ -99,18 +122,22 @@ def _draw_dimensions(c: canvas.Canvas, profile: OptimizedProfile,
 
     # --- Height dimension (right) ---
     dx = ox + w_pts + arrow_gap
-    # Line
-    c.line(dx, oy, dx, oy + h_pts)
-    # Bottom arrow
-    c.line(dx, oy, dx - arrow_size / 2, oy + arrow_size)
-    c.line(dx, oy, dx + arrow_size / 2, oy + arrow_size)
-    # Top arrow
-    c.line(dx, oy + h_pts, dx - arrow_size / 2, oy + h_pts - arrow_size)
-    c.line(dx, oy + h_pts, dx + arrow_size / 2, oy + h_pts - arrow_size)
+    c.lines([
+        # Line
+        (dx, oy, dx, oy + h_pts),
+        # Bottom arrow
+        (dx, oy, dx - arrow_size / 2, oy + arrow_size),
+        (dx, oy, dx + arrow_size / 2, oy + arrow_size),
+        # Top arrow
+        (dx, oy + h_pts, dx - arrow_size / 2, oy + h_pts - arrow_size),
+        (dx, oy + h_pts, dx + arrow_size / 2, oy + h_pts - arrow_size),
+    ])
     # Extension lines
     c.setDash(1, 2)
-    c.line(ox + w_pts, oy, dx + 4, oy)
-    c.line(ox + w_pts, oy + h_pts, dx + 4, oy + h_pts)
+    c.lines([
+        (ox + w_pts, oy, dx + 4, oy),
+        (ox + w_pts, oy + h_pts, dx + 4, oy + h_pts),
+    ])
     c.setDash()
     # Label (rotated)
     label_h = f'{profile.bbox_h:.3f}"'
@@ -156,21 +183,22 @@ def _draw_title_block(c: canvas.Canvas, part_name: str,
 def export_pdf(profile: OptimizedProfile, output_path: Path,
                part_name: str) -> None:
     """Generate a PDF drawing with the 2D profile and title block."""
-    c = canvas.Canvas(str(output_path), pagesize=letter)
+    with atomic_output(output_path) as tmp_path:
+        c = canvas.Canvas(str(tmp_path), pagesize=letter)
 
-    # Compute scale to fit the drawing area (with room for dimension labels)
-    usable_w = DRAW_AREA_W - 40  # room for right-side dim label
-    usable_h = DRAW_AREA_H - 30  # room for bottom dim label
-    scale = min(usable_w / profile.bbox_w, usable_h / profile.bbox_h)
+        # Compute scale to fit the drawing area (with room for dimension labels)
+        usable_w = DRAW_AREA_W - 40  # room for right-side dim label
+        usable_h = DRAW_AREA_H - 30  # room for bottom dim label
+        scale = min(usable_w / profile.bbox_w, usable_h / profile.bbox_h)
 
-    # Center the drawing in the available area
-    shape_w = profile.bbox_w * scale
-    shape_h = profile.bbox_h * scale
-    ox = DRAW_AREA_X + (DRAW_AREA_W - shape_w) / 2
-    oy = DRAW_AREA_Y + (DRAW_AREA_H - shape_h) / 2
+        # Center the drawing in the available area
+        shape_w = profile.bbox_w * scale
+        shape_h = profile.bbox_h * scale
+        ox = DRAW_AREA_X + (DRAW_AREA_W - shape_w) / 2
+        oy = DRAW_AREA_Y + (DRAW_AREA_H - shape_h) / 2
 
-    _draw_profile(c, profile, ox, oy, scale)
-    _draw_dimensions(c, profile, ox, oy, scale)
-    _draw_title_block(c, part_name, profile)
+        _draw_profile(c, profile, ox, oy, scale)
+        _draw_dimensions(c, profile, ox, oy, scale)
+        _draw_title_block(c, part_name, profile)
 
-    c.save()
+        c.save()
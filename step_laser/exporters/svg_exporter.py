@@ -1,104 +1,212 @@
 """
-SVG file exporter — reads a DXF file and writes clean SVG.
+SVG file exporter — writes clean SVG from the optimized profile.
 
-Directly converts DXF entities (LINE, CIRCLE, ARC, LWPOLYLINE) to SVG
-elements, preserving true arcs and circles.  Output uses inch units.
+Converts the 2D edge primitives (or, via export_svg_from_dxf, the entities
+of a DXF file: LINE, CIRCLE, ARC, LWPOLYLINE) to SVG elements, preserving
+true arcs and circles.  Output uses inch units.
 """
+import heapq
 import math
+from operator import itemgetter
 from pathlib import Path
 
 import ezdxf
 from ezdxf import bbox as ezdxf_bbox
+import numpy as np
+
+from ..projection import Arc2D, Circle2D, Line2D, Polyline2D
+from ..optimizer import OptimizedProfile
+from .atomic import atomic_output
+
+_DEG2RAD = math.pi / 180.0
+
+# Unit vectors at 0, 90, 180 and 270 degrees, the axis extremes of a circle
+_QUADRANTS = np.array([(1.0, 0.0), (0.0, 1.0), (-1.0, 0.0), (0.0, -1.0)])
+
+
+def _ccw_span(start_deg: np.ndarray, end_deg: np.ndarray) -> np.ndarray:
+    """CCW sweep from start to end in (0, 360] degrees."""
+    span = (end_deg - start_deg) % 360.0
+    span[span == 0] = 360.0
+    return span
+
+
+def _profile_extents(line_xy, circ, arc, polylines):
+    """Return the tight (xmin, ymin, xmax, ymax) of the grouped primitives."""
+    pts = [line_xy[:, :4].reshape(-1, 2),
+           circ[:, :2] - circ[:, 2:3], circ[:, :2] + circ[:, 2:3]]
+
+    c, r = arc[:, :2], arc[:, 2:3]
+    sa, span = arc[:, 3], _ccw_span(arc[:, 3], arc[:, 4])
+    ea = sa + span
+    pts.append(c + r * np.column_stack([np.cos(sa * _DEG2RAD), np.sin(sa * _DEG2RAD)]))
+    pts.append(c + r * np.column_stack([np.cos(ea * _DEG2RAD), np.sin(ea * _DEG2RAD)]))
+    # Quadrant points swept by each arc
+    for q, unit in enumerate(_QUADRANTS):
+        swept = (q * 90.0 - sa) % 360.0 <= span
+        pts.append(c[swept] + r[swept] * unit)
+
+    pts.extend(p for _, p, _ in polylines)
+    pts = np.concatenate(pts)
+    return (*pts.min(axis=0).tolist(), *pts.max(axis=0).tolist())
+
+
+def _polyline_path(pts: np.ndarray, closed: bool, ox: float, oy: float,
+                   height: float) -> str:
+    """Return the SVG path element for a polyline given in model coordinates."""
+    pts = pts.copy()
+    pts[:, 0] -= ox
+    pts[:, 1] = height - (pts[:, 1] - oy)
+    pts = pts.tolist()
+    d = "M {:.6f},{:.6f}".format(*pts[0]) + "".join(
+        " L {:.6f},{:.6f}".format(*p) for p in pts[1:]
+    )
+    if closed:
+        d += " Z"
+    return f'<path d="{d}"/>\n'
+
+
+def _write_svg(output_path: Path, extents, line_xy, circ, arc, polylines) -> None:
+    """
+    Write grouped primitives in model coordinates as an SVG.
+
+    line_xy   - (n, 5) x1, y1, x2, y2, index
+    circ      - (n, 4) cx, cy, r, index
+    arc       - (n, 6) cx, cy, r, start_deg, end_deg, index; drawn CCW as in DXF
+    polylines - list of (index, (k, 2) points, closed)
+
+    index is each element's position in the source edge/entity order; each
+    group must be sorted by it. Rows are transformed per type but written
+    back in that order, which keeps each contour's elements together (and
+    may be the cut order).
+    """
+    ox, oy, xmax, ymax = extents
+    width = xmax - ox
+    height = ymax - oy
+
+    # Shift to the extents origin and flip Y for SVG (Y-down), per type
+    line_xy = line_xy.copy()
+    line_xy[:, 0:4:2] -= ox
+    line_xy[:, 1:4:2] = height - (line_xy[:, 1:4:2] - oy)
+
+    circ = circ.copy()
+    circ[:, 0] -= ox
+    circ[:, 1] = height - (circ[:, 1] - oy)
+
+    cx, cy, r = arc[:, 0] - ox, arc[:, 1] - oy, arc[:, 2]
+    # The span drives both the end angle and the large-arc flag
+    span = _ccw_span(arc[:, 3], arc[:, 4])
+    sa = arc[:, 3] * _DEG2RAD
+    ea = (arc[:, 3] + span) * _DEG2RAD
+    # Y-flip preserves CCW winding in SVG screen coords, so sweep_flag is 0
+    arc_rows = np.column_stack([
+        cx + r * np.cos(sa), height - (cy + r * np.sin(sa)),  # start point
+        r, r, span > 180.0,                                   # radii, large_arc
+        cx + r * np.cos(ea), height - (cy + r * np.sin(ea)),  # end point
+        arc[:, 5],
+    ])
+
+    # Each group is already in ascending index order, so merging the
+    # per-type generators streams the elements back in source order
+    lines = (
+        (i, '<line x1="%.6f" y1="%.6f" x2="%.6f" y2="%.6f"/>\n' % (x1, y1, x2, y2))
+        for x1, y1, x2, y2, i in line_xy.tolist()
+    )
+    circles = (
+        (i, '<circle cx="%.6f" cy="%.6f" r="%.6f"/>\n' % (x, y, rr))
+        for x, y, rr, i in circ.tolist()
+    )
+    arcs = (
+        (row[-1], '<path d="M %.6f,%.6f A %.6f,%.6f 0 %d,0 %.6f,%.6f"/>\n' % tuple(row[:-1]))
+        for row in arc_rows.tolist()
+    )
+    paths = (
+        (i, _polyline_path(pts, closed, ox, oy, height))
+        for i, pts, closed in polylines if len(pts) >= 2
+    )
 
-
-def export_svg(dxf_path: Path, output_path: Path) -> None:
+    with atomic_output(output_path) as tmp_path, \
+            open(tmp_path, "wt", encoding="utf-8", buffering=1 << 20) as f:
+        f.write(
+            f'<?xml version="1.0" encoding="utf-8"?>\n'
+            f'<svg xmlns="http://www.w3.org/2000/svg"'
+            f' width="{width:.6f}in" height="{height:.6f}in"'
+            f' viewBox="0 0 {width:.6f} {height:.6f}">\n'
+            f'<g fill="none" stroke="black" stroke-width="0.01">\n'
+        )
+
+        f.writelines(
+            text for _, text in heapq.merge(lines, circles, arcs, paths, key=itemgetter(0))
+        )
+        f.write('</g>\n</svg>\n')
+
+
+def export_svg(profile: OptimizedProfile, output_path: Path) -> None:
+    """Write an SVG of the optimized profile with inch units."""
+    groups = {Line2D: [], Circle2D: [], Arc2D: [], Polyline2D: []}
+    for i, edge in enumerate(profile.edges):
+        group = groups.get(type(edge))
+        if group is not None:
+            group.append((i, edge))
+
+    line_xy = np.array(
+        [(e.x1, e.y1, e.x2, e.y2, i) for i, e in groups[Line2D]], dtype=np.float64
+    ).reshape(-1, 5)
+    circ = np.array(
+        [(e.cx, e.cy, e.r, i) for i, e in groups[Circle2D]], dtype=np.float64
+    ).reshape(-1, 4)
+
+    # Same CCW start/end as the DXF exporter: CW arcs swap their ends
+    arc = np.array([
+        (e.cx, e.cy, e.r, e.start_deg, e.start_deg + e.sweep_deg, i) if e.sweep_deg > 0
+        else (e.cx, e.cy, e.r, e.start_deg + e.sweep_deg, e.start_deg, i)
+        for i, e in groups[Arc2D]
+    ], dtype=np.float64).reshape(-1, 6)
+
+    polylines = [
+        (i, np.asarray(e.points, dtype=np.float64).reshape(-1, 2), False)
+        for i, e in groups[Polyline2D] if len(e.points) >= 2
+    ]
+
+    extents = _profile_extents(line_xy, circ, arc, polylines)
+    _write_svg(output_path, extents, line_xy, circ, arc, polylines)
+
+
+def export_svg_from_dxf(dxf_path: Path, output_path: Path) -> None:
     """Read a DXF file and write an SVG with inch units."""
     doc = ezdxf.readfile(str(dxf_path))
     msp = doc.modelspace()
 
     # Compute extents from actual entity geometry
     extents = ezdxf_bbox.extents(msp)
-    ox = extents.extmin[0]
-    oy = extents.extmin[1]
-    width = extents.extmax[0] - ox
-    height = extents.extmax[1] - oy
-
-    parts: list[str] = []
-
-    for entity in msp:
-        dxftype = entity.dxftype()
-
-        if dxftype == "LINE":
-            x1 = entity.dxf.start[0] - ox
-            y1 = height - (entity.dxf.start[1] - oy)
-            x2 = entity.dxf.end[0] - ox
-            y2 = height - (entity.dxf.end[1] - oy)
-            parts.append(
-                f'<line x1="{x1:.6f}" y1="{y1:.6f}" '
-                f'x2="{x2:.6f}" y2="{y2:.6f}"/>'
-            )
-
-        elif dxftype == "CIRCLE":
-            cx = entity.dxf.center[0] - ox
-            cy = height - (entity.dxf.center[1] - oy)
-            r = entity.dxf.radius
-            parts.append(
-                f'<circle cx="{cx:.6f}" cy="{cy:.6f}" r="{r:.6f}"/>'
-            )
-
-        elif dxftype == "ARC":
-            cx = entity.dxf.center[0] - ox
-            cy_dxf = entity.dxf.center[1] - oy
-            r = entity.dxf.radius
-            sa = math.radians(entity.dxf.start_angle)
-            ea = math.radians(entity.dxf.end_angle)
-
-            # Start / end points in offset-adjusted DXF coords
-            sx = cx + r * math.cos(sa)
-            sy_dxf = cy_dxf + r * math.sin(sa)
-            ex = cx + r * math.cos(ea)
-            ey_dxf = cy_dxf + r * math.sin(ea)
-
-            # Flip Y for SVG (Y-down)
-            sy = height - sy_dxf
-            ey = height - ey_dxf
-
-            # DXF arcs are always CCW; compute angular span
-            span = (entity.dxf.end_angle - entity.dxf.start_angle) % 360.0
-            if span == 0:
-                span = 360.0
-            large_arc = 1 if span > 180.0 else 0
-            # Y-flip preserves CCW winding in SVG screen coords
-            sweep_flag = 0
-
-            parts.append(
-                f'<path d="M {sx:.6f},{sy:.6f} '
-                f'A {r:.6f},{r:.6f} 0 {large_arc},{sweep_flag} '
-                f'{ex:.6f},{ey:.6f}"/>'
-            )
-
-        elif dxftype == "LWPOLYLINE":
-            pts = list(entity.get_points(format="xy"))
-            if len(pts) >= 2:
-                px, py = pts[0]
-                d = f"M {px - ox:.6f},{height - (py - oy):.6f}"
-                for px, py in pts[1:]:
-                    d += f" L {px - ox:.6f},{height - (py - oy):.6f}"
-                if entity.closed:
-                    d += " Z"
-                parts.append(f'<path d="{d}"/>')
-
-    elements = "\n".join(parts)
-    svg_content = (
-        f'<?xml version="1.0" encoding="utf-8"?>\n'
-        f'<svg xmlns="http://www.w3.org/2000/svg"'
-        f' width="{width:.6f}in" height="{height:.6f}in"'
-        f' viewBox="0 0 {width:.6f} {height:.6f}">\n'
-        f'<g fill="none" stroke="black" stroke-width="0.01">\n'
-        f'{elements}\n'
-        f'</g>\n'
-        f'</svg>\n'
-    )
 
-    with open(str(output_path), "wt", encoding="utf-8") as f:
-        f.write(svg_content)
+    groups = {"LINE": [], "CIRCLE": [], "ARC": [], "LWPOLYLINE": []}
+    for i, entity in enumerate(msp):
+        group = groups.get(entity.dxftype())
+        if group is not None:
+            group.append((i, entity))
+
+    line_xy = np.array(
+        [(e.dxf.start[0], e.dxf.start[1], e.dxf.end[0], e.dxf.end[1], i)
+         for i, e in groups["LINE"]], dtype=np.float64
+    ).reshape(-1, 5)
+    circ = np.array(
+        [(e.dxf.center[0], e.dxf.center[1], e.dxf.radius, i)
+         for i, e in groups["CIRCLE"]], dtype=np.float64
+    ).reshape(-1, 4)
+    arc = np.array(
+        [(e.dxf.center[0], e.dxf.center[1], e.dxf.radius,
+          e.dxf.start_angle, e.dxf.end_angle, i) for i, e in groups["ARC"]],
+        dtype=np.float64,
+    ).reshape(-1, 6)
+    polylines = [
+        (i, np.asarray(list(e.get_points(format="xy")), dtype=np.float64).reshape(-1, 2),
+         e.closed)
+        for i, e in groups["LWPOLYLINE"]
+    ]
+
+    _write_svg(
+        output_path,
+        (extents.extmin[0], extents.extmin[1], extents.extmax[0], extents.extmax[1]),
+        line_xy, circ, arc, polylines,
+    )
@@ -2,89 +2,147 @@
 step-laser: Batch convert STEP files to DXF, SVG, and PDF for laser cutting.
 
 Usage:
-    python -m step_laser.main <folder_path>
+    python -m step_laser.main <folder_path> [--jobs N]
 
-Scans <folder_path> for .step files and generates DXF, SVG, and PDF for each
+Scans <folder_path> for .step/.stp files and generates DXF, SVG, and PDF for each
 part in the same folder, with filenames like <stem>_converted.dxf.
 """
+import logging
+import os
 import sys
-import traceback
 from pathlib import Path
+from typing import List, Optional, Tuple
 
 import click
 
-from .step_reader import load_step
+from . import batch_log
+from .step_reader import limit_occ_threads, load_step
 from .projection import extract_profile
 from .optimizer import optimize_rotation
 from .exporters.dxf_exporter import export_dxf
 from .exporters.svg_exporter import export_svg
 from .exporters.pdf_exporter import export_pdf
 
+logger = logging.getLogger(__name__)
+
+# Matched case-insensitively, so .STEP and .STP files are found too
+STEP_SUFFIXES = (".step", ".stp")
+
+
+def output_stem(step_path: Path) -> str:
+    """Return the stem shared by a STEP file's DXF, SVG and PDF outputs."""
+    return step_path.stem.replace(" ", "_")
+
+
+def split_output_collisions(
+        step_files: List[Path]) -> Tuple[List[Path], List[Tuple[Path, Path]]]:
+    """
+    Split step_files into files to process and (skipped, kept) pairs.
+
+    part.step and part.stp (or "part a" and "part_a") would write the same
+    outputs, and in parallel the two workers would write them at once. The
+    first file in list order keeps the name. Stems are compared
+    case-insensitively because Windows file names are.
+    """
+    owners = {}
+    kept, skipped = [], []
+    for p in step_files:
+        owner = owners.setdefault(output_stem(p).lower(), p)
+        if owner is p:
+            kept.append(p)
+        else:
+            skipped.append((p, owner))
+    return kept, skipped
+
 
 def process_step_file(step_path: Path) -> None:
     """Process a single STEP file: extract profile, optimize, export."""
-    stem = step_path.stem.replace(" ", "_")
+    stem = output_stem(step_path)
     part_name = step_path.stem  # human-readable, with spaces
 
-    print(f"  Loading STEP file...")
+    logger.info("  Loading STEP file...")
     shape, unit_to_inches = load_step(step_path)
 
-    print(f"  Extracting 2D profile...")
+    logger.info("  Extracting 2D profile...")
     profile = extract_profile(shape, unit_to_inches)
-    print(f"    Extrusion axis: {profile.extrusion_axis}")
-    print(f"    Thickness: {profile.thickness_inches:.3f}\"")
-    print(f"    Edges extracted: {len(profile.edges)}")
+    logger.info(f"    Extrusion axis: {profile.extrusion_axis}")
+    logger.info(f"    Thickness: {profile.thickness_inches:.3f}\"")
+    logger.info(f"    Edges extracted: {len(profile.edges)}")
 
-    print(f"  Optimizing rotation...")
+    logger.info("  Optimizing rotation...")
     optimized = optimize_rotation(profile)
-    print(f"    Rotation: {optimized.rotation_deg:.1f}\u00b0")
-    print(f"    Bounding box: {optimized.bbox_w:.3f}\" \u00d7 {optimized.bbox_h:.3f}\"")
+    logger.info(f"    Rotation: {optimized.rotation_deg:.1f}\u00b0")
+    logger.info(f"    Bounding box: {optimized.bbox_w:.3f}\" \u00d7 {optimized.bbox_h:.3f}\"")
 
     out = step_path.parent
 
     dxf_out = out / f"{stem}.dxf"
     export_dxf(optimized, dxf_out)
-    print(f"  Exported: {dxf_out.name}")
+    logger.info(f"  Exported: {dxf_out.name}")
 
     svg_out = out / f"{stem}.svg"
-    export_svg(dxf_out, svg_out)
-    print(f"  Exported: {svg_out.name}")
+    export_svg(optimized, svg_out)
+    logger.info(f"  Exported: {svg_out.name}")
 
     pdf_out = out / f"{stem}.pdf"
     export_pdf(optimized, pdf_out, part_name)
-    print(f"  Exported: {pdf_out.name}")
+    logger.info(f"  Exported: {pdf_out.name}")
+
+
+def _configure_logging() -> None:
+    """Print log records to stdout."""
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+
+
+def init_worker(events) -> None:
+    """Pool initializer: cap OCC threads and send tagged log records to events."""
+    limit_occ_threads()
+    batch_log.init_worker(events)
 
 
 @click.command()
 @click.argument("folder", type=click.Path(exists=True, file_okay=False))
-def main(folder: str) -> None:
+@click.option("--jobs", "-j", type=click.IntRange(min=1), default=None,
+              help="Maximum files processed in parallel (default: CPU count).")
+def main(folder: str, jobs: Optional[int]) -> None:
     """Batch convert STEP files in FOLDER to DXF/SVG/PDF for laser cutting."""
+    _configure_logging()
     folder_path = Path(folder).resolve()
 
-    step_files = sorted(folder_path.glob("*.step"), key=lambda p: p.name.lower())
+    with os.scandir(folder_path) as it:
+        entries = [
+            e for e in it
+            if e.is_file() and e.name.lower().endswith(STEP_SUFFIXES)
+        ]
+    entries.sort(key=lambda e: e.name.lower())
+    step_files = [Path(e.path) for e in entries]
     if not step_files:
-        click.echo(f"No .step files found in {folder_path}")
+        click.echo(f"No .step/.stp files found in {folder_path}")
         sys.exit(1)
 
     click.echo(f"Found {len(step_files)} STEP file(s) in: {folder_path.name}\n")
+    total = len(step_files)
 
-    success = 0
     errors = []
 
-    for i, step_path in enumerate(step_files, 1):
-        click.echo(f"[{i}/{len(step_files)}] Processing: {step_path.name}")
-        try:
-            process_step_file(step_path)
-            success += 1
-            click.echo(f"  Done.\n")
-        except Exception as e:
-            errors.append((step_path.name, str(e)))
-            click.echo(f"  ERROR: {e}")
-            traceback.print_exc()
-            click.echo()
+    step_files, skipped = split_output_collisions(step_files)
+    for p, owner in skipped:
+        msg = f"same output names as {owner.name}"
+        errors.append((p.name, msg))
+        click.echo(f"Skipping {p.name}: {msg}\n")
+
+    # OCC holds the GIL, so files are spread over processes, not threads.
+    # Each worker runs OCC single-threaded (limit_occ_threads), so the
+    # default is one worker per core. Each file's log is printed as one
+    # block (see batch_log).
+    workers = min(jobs or os.cpu_count() or 1, len(step_files))
+    result = batch_log.run_in_pool(process_step_file, step_files, workers, click.echo,
+                                   initializer=init_worker)
+    success = result.success
+    errors += result.errors
 
     click.echo("=" * 50)
-    click.echo(f"Processed: {success}/{len(step_files)} files successfully")
+    click.echo(f"Processed: {success}/{total} files successfully")
     if errors:
         click.echo(f"Errors ({len(errors)}):")
         for name, err in errors:
@@ -3,16 +3,17 @@ Minimum bounding box rotation optimizer.
 
 Finds the rotation angle that minimizes the axis-aligned bounding box area
 of the 2D profile, then applies that rotation to all edge primitives and
-translates so the minimum corner sits at (0, 0).
+translates so the minimum corner sits at (0, 0). Edge coordinates are packed
+into one array so each rigid motion is a single NumPy operation.
 """
 from __future__ import annotations
 
 import math
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import List
 
 import numpy as np
-from shapely.geometry import MultiPoint
+import shapely
 
 from .projection import (
     Arc2D,
@@ -34,100 +35,219 @@ class OptimizedProfile:
     thickness_inches: float
 
 
-def _sample_arc_points(arc: Arc2D, n_per_full_circle: int = 64) -> List[Tuple[float, float]]:
-    """Sample points along an arc using its sweep_deg."""
-    pts = [(arc.x1, arc.y1), (arc.x2, arc.y2)]
-    sa = math.radians(arc.start_deg)
-    sweep_rad = math.radians(arc.sweep_deg)
-    n = max(8, int(abs(arc.sweep_deg) / 360 * n_per_full_circle))
-    for i in range(1, n):
-        a = sa + sweep_rad * i / n
-        pts.append((arc.cx + arc.r * math.cos(a), arc.cy + arc.r * math.sin(a)))
-    return pts
+# (cos, sin) of 16 evenly spaced angles, shared by every sampled circle.
+# Circle samples only steer the hull/angle search (the bounding box uses
+# each circle's exact extent), and most circles are holes that never
+# reach the hull, so 16 points keep the hull input small.
+_UNIT_CIRCLE_16 = np.column_stack([
+    np.cos(np.linspace(0, 2 * np.pi, 16, endpoint=False)),
+    np.sin(np.linspace(0, 2 * np.pi, 16, endpoint=False)),
+])
 
 
-def _sample_points(edges: list) -> List[Tuple[float, float]]:
-    """Collect representative 2D points from all edges for convex hull."""
-    pts = []
+def _sample_arcs(arcs: list, n_per_full_circle: int = 64) -> np.ndarray:
+    """
+    Sample points along every arc using its sweep_deg, as one (N, 2) array.
+
+    Each arc contributes its two endpoints plus n - 1 interior points, with
+    n scaled by the sweep; all arcs are evaluated in a single pass.
+    """
+    params = np.array([
+        (e.cx, e.cy, e.r, e.start_deg, e.sweep_deg, e.x1, e.y1, e.x2, e.y2)
+        for e in arcs
+    ])
+    cx, cy, r, start_deg, sweep_deg = params[:, :5].T
+    n = np.maximum(8, (np.abs(sweep_deg) / 360 * n_per_full_circle).astype(np.int64))
+
+    # Interior sample k = 1 .. n - 1 of each arc, flattened across arcs
+    counts = n - 1
+    idx = np.repeat(np.arange(len(arcs)), counts)
+    k = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + 1
+    a = np.radians(start_deg)[idx] + np.radians(sweep_deg)[idx] * k / n[idx]
+
+    interior = np.column_stack([
+        cx[idx] + r[idx] * np.cos(a),
+        cy[idx] + r[idx] * np.sin(a),
+    ])
+    return np.concatenate([params[:, 5:7], params[:, 7:9], interior])
+
+
+def _sample_line(e: Line2D) -> tuple:
+    return (e.x1, e.y1), (e.x2, e.y2)
+
+
+def _sample_circle(e: Circle2D) -> np.ndarray:
+    return (e.cx, e.cy) + e.r * _UNIT_CIRCLE_16
+
+
+def _polyline_points(e: Polyline2D) -> list:
+    return e.points
+
+
+def _no_points(e) -> tuple:
+    return ()
+
+
+# Arcs are gathered and sampled together by _sample_arcs.
+_SAMPLERS = {
+    Line2D: _sample_line,
+    Circle2D: _sample_circle,
+    Polyline2D: _polyline_points,
+}
+
+
+def _sample_points(edges: list) -> np.ndarray:
+    """Collect representative 2D points from all edges as an (N, 2) array."""
+    arcs = []
+    chunks = []
     for e in edges:
-        if isinstance(e, Line2D):
-            pts.append((e.x1, e.y1))
-            pts.append((e.x2, e.y2))
-        elif isinstance(e, Circle2D):
-            for i in range(64):
-                a = 2 * math.pi * i / 64
-                pts.append((e.cx + e.r * math.cos(a), e.cy + e.r * math.sin(a)))
-        elif isinstance(e, Arc2D):
-            pts.extend(_sample_arc_points(e))
-        elif isinstance(e, Polyline2D):
-            pts.extend(e.points)
-    return pts
-
-
-def _find_optimal_angle(pts: List[Tuple[float, float]]) -> float:
+        if type(e) is Arc2D:
+            arcs.append(e)
+            continue
+        chunks.append(
+            np.asarray(_SAMPLERS.get(type(e), _no_points)(e), dtype=np.float64).reshape(-1, 2)
+        )
+    if arcs:
+        chunks.append(_sample_arcs(arcs))
+    return np.concatenate(chunks) if chunks else np.empty((0, 2))
+
+
+def _akl_toussaint(pts: np.ndarray) -> np.ndarray:
+    """
+    Drop points strictly inside the quadrilateral spanned by the x/y extremes.
+
+    Such points can never be hull vertices, and for profiles with many
+    sampled holes they are the large majority.
+    """
+    # West, south, east, north extremes: a counter-clockwise quadrilateral
+    quad = pts[[pts[:, 0].argmin(), pts[:, 1].argmin(),
+                pts[:, 0].argmax(), pts[:, 1].argmax()]]
+    edge = np.roll(quad, -1, axis=0) - quad               # (4, 2)
+    rel = pts[:, None, :] - quad[None, :, :]              # (N, 4, 2)
+    cross = edge[:, 0] * rel[:, :, 1] - edge[:, 1] * rel[:, :, 0]
+    return pts[~(cross > 0).all(axis=1)]
+
+
+def _find_optimal_basis(pts: np.ndarray) -> tuple:
     """
-    Find the rotation angle (degrees) that minimizes the axis-aligned
-    bounding box area using shapely's minimum_rotated_rectangle.
+    Find the rotation (cos_a, sin_a) that minimizes the axis-aligned
+    bounding box area, using rotating calipers over the convex hull.
+
+    The minimum-area rectangle always has a side collinear with a hull
+    edge, so every hull edge direction is evaluated at once. The winning
+    edge's unit vector is returned negated, so applying the rotation lays
+    that edge along the X axis without a round trip through angles.
     """
     if len(pts) < 3:
-        return 0.0
-
-    mp = MultiPoint(pts)
-    hull = mp.convex_hull
-    mrr = hull.minimum_rotated_rectangle
-
-    coords = list(mrr.exterior.coords)
-    edge_vec = np.array(coords[1]) - np.array(coords[0])
-    angle_rad = math.atan2(edge_vec[1], edge_vec[0])
-    return math.degrees(angle_rad)
-
-
-def _rotate_point(x: float, y: float, cos_a: float, sin_a: float) -> Tuple[float, float]:
-    return (x * cos_a - y * sin_a, x * sin_a + y * cos_a)
-
-
-def _rotate_edge(edge, cos_a: float, sin_a: float):
-    """Return a new edge primitive rotated by angle."""
-    if isinstance(edge, Line2D):
-        x1r, y1r = _rotate_point(edge.x1, edge.y1, cos_a, sin_a)
-        x2r, y2r = _rotate_point(edge.x2, edge.y2, cos_a, sin_a)
-        return Line2D(x1r, y1r, x2r, y2r)
-    elif isinstance(edge, Circle2D):
-        cxr, cyr = _rotate_point(edge.cx, edge.cy, cos_a, sin_a)
-        return Circle2D(cxr, cyr, edge.r)
-    elif isinstance(edge, Arc2D):
-        cxr, cyr = _rotate_point(edge.cx, edge.cy, cos_a, sin_a)
-        x1r, y1r = _rotate_point(edge.x1, edge.y1, cos_a, sin_a)
-        x2r, y2r = _rotate_point(edge.x2, edge.y2, cos_a, sin_a)
-        angle_offset = math.degrees(math.atan2(sin_a, cos_a))
-        return Arc2D(
-            cxr, cyr, edge.r,
-            edge.start_deg + angle_offset,
-            edge.sweep_deg,  # sweep magnitude/direction unchanged by rotation
-            x1r, y1r, x2r, y2r,
-        )
-    elif isinstance(edge, Polyline2D):
-        new_pts = [_rotate_point(x, y, cos_a, sin_a) for x, y in edge.points]
-        return Polyline2D(new_pts)
-    return edge
-
-
-def _translate_edge(edge, dx: float, dy: float):
-    """Return a new edge primitive translated by (dx, dy)."""
-    if isinstance(edge, Line2D):
-        return Line2D(edge.x1 + dx, edge.y1 + dy, edge.x2 + dx, edge.y2 + dy)
-    elif isinstance(edge, Circle2D):
-        return Circle2D(edge.cx + dx, edge.cy + dy, edge.r)
-    elif isinstance(edge, Arc2D):
-        return Arc2D(
-            edge.cx + dx, edge.cy + dy, edge.r,
-            edge.start_deg, edge.sweep_deg,
-            edge.x1 + dx, edge.y1 + dy,
-            edge.x2 + dx, edge.y2 + dy,
-        )
-    elif isinstance(edge, Polyline2D):
-        return Polyline2D([(x + dx, y + dy) for x, y in edge.points])
-    return edge
+        return 1.0, 0.0
+
+    hull = shapely.get_coordinates(
+        shapely.convex_hull(shapely.multipoints(_akl_toussaint(pts)))
+    )
+    edges = np.diff(np.vstack([hull, hull[:1]]), axis=0)
+    lengths = np.hypot(edges[:, 0], edges[:, 1])
+    keep = lengths > 1e-12
+    if not keep.any():
+        return 1.0, 0.0
+    cos_t = edges[keep, 0] / lengths[keep]
+    sin_t = edges[keep, 1] / lengths[keep]
+
+    # (k, 2, 2) rotations taking each edge onto the X axis
+    rot = np.stack([
+        np.stack([cos_t, sin_t], axis=1),
+        np.stack([-sin_t, cos_t], axis=1),
+    ], axis=1)
+    proj = np.einsum("kij,nj->kni", rot, hull)
+    extent = proj.max(axis=1) - proj.min(axis=1)
+    areas = extent[:, 0] * extent[:, 1]
+    best = int(np.argmin(areas))
+    return float(cos_t[best]), float(-sin_t[best])
+
+
+def _line_coords(e: Line2D) -> tuple:
+    return (e.x1, e.y1), (e.x2, e.y2)
+
+
+def _circle_coords(e: Circle2D) -> tuple:
+    return ((e.cx, e.cy),)
+
+
+def _arc_coords(e: Arc2D) -> tuple:
+    return (e.cx, e.cy), (e.x1, e.y1), (e.x2, e.y2)
+
+
+# type(edge) -> coordinate pairs packed by _edge_coords
+_COORDS = {
+    Line2D: _line_coords,
+    Circle2D: _circle_coords,
+    Arc2D: _arc_coords,
+    Polyline2D: _polyline_points,
+}
+
+
+def _edge_coords(edges: list) -> np.ndarray:
+    """
+    Pack every coordinate pair of edges into one (M, 2) array, in edge order:
+    line endpoints, circle centers, arc center + endpoints, polyline points.
+    """
+    coords = []
+    for e in edges:
+        coords.extend(_COORDS.get(type(e), _no_points)(e))
+    return np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+
+
+def _line_from(e: Line2D, flat: list, i: int, angle_offset: float):
+    (x1, y1), (x2, y2) = flat[i:i + 2]
+    return Line2D(x1, y1, x2, y2), i + 2
+
+
+def _circle_from(e: Circle2D, flat: list, i: int, angle_offset: float):
+    cx, cy = flat[i]
+    return Circle2D(cx, cy, e.r), i + 1
+
+
+def _arc_from(e: Arc2D, flat: list, i: int, angle_offset: float):
+    (cx, cy), (x1, y1), (x2, y2) = flat[i:i + 3]
+    return Arc2D(
+        cx, cy, e.r,
+        e.start_deg + angle_offset,
+        e.sweep_deg,  # sweep magnitude/direction unchanged by rotation
+        x1, y1, x2, y2,
+    ), i + 3
+
+
+def _polyline_from(e: Polyline2D, flat: list, i: int, angle_offset: float):
+    n = len(e.points)
+    return Polyline2D([(x, y) for x, y in flat[i:i + n]]), i + n
+
+
+def _unchanged(e, flat: list, i: int, angle_offset: float):
+    return e, i
+
+
+# type(edge) -> rebuilder returning (new_edge, next coords index)
+_REBUILDERS = {
+    Line2D: _line_from,
+    Circle2D: _circle_from,
+    Arc2D: _arc_from,
+    Polyline2D: _polyline_from,
+}
+
+
+def _edges_from_coords(edges: list, coords: np.ndarray, angle_offset: float) -> list:
+    """
+    Rebuild edge primitives from coords laid out by _edge_coords.
+
+    Arc start angles are shifted by angle_offset degrees; sweeps and radii
+    are unchanged by rigid motions.
+    """
+    flat = coords.tolist()
+    i = 0
+    out = []
+    for e in edges:
+        new_e, i = _REBUILDERS.get(type(e), _unchanged)(e, flat, i, angle_offset)
+        out.append(new_e)
+    return out
 
 
 def optimize_rotation(profile: ProfileResult) -> OptimizedProfile:
@@ -136,38 +256,35 @@ def optimize_rotation(profile: ProfileResult) -> OptimizedProfile:
     and translate so the min corner is at (0, 0).
     """
     pts = _sample_points(profile.edges)
-    angle_deg = _find_optimal_angle(pts)
-
-    # Rotate by the negative of the MRR angle to align axis-aligned
-    rad = math.radians(-angle_deg)
-    cos_a = math.cos(rad)
-    sin_a = math.sin(rad)
-
-    rotated_edges = [_rotate_edge(e, cos_a, sin_a) for e in profile.edges]
-    rotated_wires = [
-        [_rotate_edge(e, cos_a, sin_a) for e in wire]
-        for wire in profile.wires
-    ]
-
-    # Find bounding box of rotated geometry
-    rotated_pts = _sample_points(rotated_edges)
-    xs = [p[0] for p in rotated_pts]
-    ys = [p[1] for p in rotated_pts]
-    xmin, xmax = min(xs), max(xs)
-    ymin, ymax = min(ys), max(ys)
-
-    dx, dy = -xmin, -ymin
-    translated_edges = [_translate_edge(e, dx, dy) for e in rotated_edges]
-    translated_wires = [
-        [_translate_edge(e, dx, dy) for e in wire]
-        for wire in rotated_wires
-    ]
+    cos_a, sin_a = _find_optimal_basis(pts)
+    rot = np.array([[cos_a, -sin_a], [sin_a, cos_a]])
+    # Degrees only for arc start angles and the reported rotation
+    angle_offset = math.degrees(math.atan2(sin_a, cos_a))
+
+    # Bounding box from the already-sampled points, rotated rigidly instead
+    # of re-sampling rotated edges. Circles add their exact center +/- r
+    # box, since their fixed-angle samples no longer hit the axis extremes.
+    circles = np.array(
+        [(e.cx, e.cy, e.r) for e in profile.edges if isinstance(e, Circle2D)]
+    ).reshape(-1, 3)
+    centers = circles[:, :2] @ rot.T
+    radii = circles[:, 2:]
+    rotated_pts = pts @ rot.T
+    xmin, ymin = np.vstack([rotated_pts, centers - radii]).min(axis=0).tolist()
+    xmax, ymax = np.vstack([rotated_pts, centers + radii]).max(axis=0).tolist()
+
+    # All edge coordinates rotated and translated in one expression
+    coords = _edge_coords(profile.edges) @ rot.T - (xmin, ymin)
+    translated_edges = _edges_from_coords(profile.edges, coords, angle_offset)
+    # Wires hold the same edge objects as profile.edges; regroup by identity
+    by_id = {id(e): t for e, t in zip(profile.edges, translated_edges)}
+    translated_wires = [[by_id[id(e)] for e in wire] for wire in profile.wires]
 
     return OptimizedProfile(
         edges=translated_edges,
         wires=translated_wires,
         bbox_w=xmax - xmin,
         bbox_h=ymax - ymin,
-        rotation_deg=-angle_deg,
+        rotation_deg=angle_offset,
         thickness_inches=profile.thickness_inches,
     )
@@ -21,17 +21,21 @@ from OCP.gp import gp_Vec
 import cadquery as cq
 
 # -- Primitive types returned by extract_profile --------------------------
+# __slots__ is spelled out (not dataclass(slots=True)) to keep Python 3.9
 
 @dataclass
 class Line2D:
+    __slots__ = ("x1", "y1", "x2", "y2")
     x1: float; y1: float; x2: float; y2: float
 
 @dataclass
 class Circle2D:
+    __slots__ = ("cx", "cy", "r")
     cx: float; cy: float; r: float
 
 @dataclass
 class Arc2D:
+    __slots__ = ("cx", "cy", "r", "start_deg", "sweep_deg", "x1", "y1", "x2", "y2")
     cx: float; cy: float; r: float
     start_deg: float   # angle of start point from center (degrees)
     sweep_deg: float   # angular extent: positive=CCW, negative=CW
@@ -40,6 +44,7 @@ class Arc2D:
 
 @dataclass
 class Polyline2D:
+    __slots__ = ("points",)
     points: List[Tuple[float, float]]
 
 @dataclass
@@ -59,12 +64,11 @@ AXIS_VECTORS = {
 }
 
 
-def _normalize_angle(a: float) -> float:
-    """Normalize angle to [0, 360) degrees."""
-    a = a % 360
-    if a < 0:
-        a += 360
-    return a
+# OCP adaptors can be rebound to a new edge instead of rebuilt per edge
+_ADAPTOR_REBINDS = hasattr(BRepAdaptor_Curve, "Initialize")
+
+# Columns kept when dropping each extrusion axis from (x, y, z)
+_AXIS_KEEP = {"X": [1, 2], "Y": [0, 2], "Z": [0, 1]}
 
 
 def _face_area(face) -> float:
@@ -75,32 +79,41 @@ def _face_area(face) -> float:
     return props.Mass()
 
 
+def _largest_face(faces: list, area_cache: dict):
+    """
+    Return the face with the largest area (the first one on ties).
+
+    Areas are computed once and kept in area_cache, keyed by id(face).
+    """
+    areas = []
+    for face in faces:
+        area = area_cache.get(id(face))
+        if area is None:
+            area = area_cache[id(face)] = _face_area(face)
+        areas.append(area)
+    return faces[int(np.argmax(areas))]
+
+
 def _is_rectangle(edges_2d: list) -> bool:
     """Check if a set of 2D edges forms a simple rectangle."""
-    lines = [e for e in edges_2d if isinstance(e, Line2D)]
-    if len(lines) != len(edges_2d) or len(lines) != 4:
+    if len(edges_2d) != 4:
         return False
+    for e in edges_2d:
+        if not isinstance(e, Line2D):
+            return False
     for i in range(4):
-        a = lines[i]
-        b = lines[(i + 1) % 4]
-        va = np.array([a.x2 - a.x1, a.y2 - a.y1])
-        vb = np.array([b.x2 - b.x1, b.y2 - b.y1])
-        dot = np.dot(va, vb) / (np.linalg.norm(va) * np.linalg.norm(vb) + 1e-12)
-        if abs(dot) > 0.05:
+        a = edges_2d[i]
+        b = edges_2d[(i + 1) % 4]
+        dxa, dya = a.x2 - a.x1, a.y2 - a.y1
+        dxb, dyb = b.x2 - b.x1, b.y2 - b.y1
+        # |cos| of the corner angle, kept in plain floats for four 2-vectors
+        na = math.hypot(dxa, dya)
+        nb = math.hypot(dxb, dyb)
+        if abs(dxa * dxb + dya * dyb) > 0.05 * na * nb:
             return False
     return True
 
 
-def _drop_axis(x, y, z, axis: str) -> Tuple[float, float]:
-    """Project a 3D point to 2D by dropping the extrusion axis."""
-    if axis == "X":
-        return (y, z)
-    elif axis == "Y":
-        return (x, z)
-    else:  # Z
-        return (x, y)
-
-
 def _extract_edges_from_wire(wire, axis: str, scale: float) -> list:
     """
     Extract 2D edge primitives from an OCC wire.
@@ -109,10 +122,19 @@ def _extract_edges_from_wire(wire, axis: str, scale: float) -> list:
     axis  - the extrusion axis to drop ('X', 'Y', or 'Z')
     scale - unit_to_inches conversion factor
     """
+    # First pass: query OCC and collect raw 3D points per primitive kind.
+    # edges_2d keeps wire order; lines, circles and arcs are filled in below.
     edges_2d = []
+    line_slots, line_pts = [], []
+    circle_slots, circle_pts, circle_r = [], [], []
+    arc_slots, arc_pts, arc_r = [], [], []
 
+    adaptor = BRepAdaptor_Curve() if _ADAPTOR_REBINDS else None
     for edge in wire.Edges():
-        adaptor = BRepAdaptor_Curve(edge.wrapped)
+        if _ADAPTOR_REBINDS:
+            adaptor.Initialize(edge.wrapped)
+        else:
+            adaptor = BRepAdaptor_Curve(edge.wrapped)
         curve_type = adaptor.GetType()
         first = adaptor.FirstParameter()
         last = adaptor.LastParameter()
@@ -124,79 +146,85 @@ def _extract_edges_from_wire(wire, axis: str, scale: float) -> list:
         if curve_type == GeomAbs_Line:
             p1 = adaptor.Value(first)
             p2 = adaptor.Value(last)
-            u1, v1 = _drop_axis(p1.X(), p1.Y(), p1.Z(), axis)
-            u2, v2 = _drop_axis(p2.X(), p2.Y(), p2.Z(), axis)
-            edges_2d.append(Line2D(
-                u1 * scale, v1 * scale,
-                u2 * scale, v2 * scale,
-            ))
+            line_slots.append(len(edges_2d))
+            line_pts.append(((p1.X(), p1.Y(), p1.Z()), (p2.X(), p2.Y(), p2.Z())))
+            edges_2d.append(None)
 
         elif curve_type == GeomAbs_Circle:
             circ = adaptor.Circle()
             center = circ.Location()
-            radius = circ.Radius()
-            cx, cy = _drop_axis(center.X(), center.Y(), center.Z(), axis)
-            cx *= scale
-            cy *= scale
-            r = radius * scale
-
-            p1 = adaptor.Value(first)
-            p2 = adaptor.Value(last)
-            u1, v1 = _drop_axis(p1.X(), p1.Y(), p1.Z(), axis)
-            u2, v2 = _drop_axis(p2.X(), p2.Y(), p2.Z(), axis)
-            u1 *= scale; v1 *= scale; u2 *= scale; v2 *= scale
+            c = (center.X(), center.Y(), center.Z())
 
             # Full circle check
             if abs(last - first - 2 * math.pi) < 1e-6:
-                edges_2d.append(Circle2D(cx, cy, r))
+                circle_slots.append(len(edges_2d))
+                circle_pts.append(c)
+                circle_r.append(circ.Radius())
             else:
-                # Compute start/end angles from projected 2D points
-                start_rad = math.atan2(v1 - cy, u1 - cx)
-                end_rad = math.atan2(v2 - cy, u2 - cx)
-
-                # Use the parametric midpoint to determine sweep direction.
-                # The OCC edge goes from first -> last in its parameterization;
-                # by sampling the midpoint we know which way the arc actually goes.
-                p_mid = adaptor.Value((first + last) / 2)
-                um, vm = _drop_axis(p_mid.X(), p_mid.Y(), p_mid.Z(), axis)
-                um *= scale; vm *= scale
-                mid_rad = math.atan2(vm - cy, um - cx)
-
-                start_deg = math.degrees(start_rad)
-                end_deg = math.degrees(end_rad)
-                mid_deg = math.degrees(mid_rad)
-
-                # Compute CCW sweep from start to end
-                ccw_sweep = _normalize_angle(end_deg - start_deg)
-                if ccw_sweep == 0:
-                    ccw_sweep = 360.0
-
-                # Check if midpoint lies within the CCW sweep
-                mid_from_start = _normalize_angle(mid_deg - start_deg)
-
-                if mid_from_start <= ccw_sweep + 0.5:
-                    # CCW direction is correct
-                    sweep_deg = ccw_sweep
-                else:
-                    # CW direction: negative sweep
-                    sweep_deg = ccw_sweep - 360.0
-
-                edges_2d.append(Arc2D(
-                    cx, cy, r,
-                    start_deg, sweep_deg,
-                    u1, v1, u2, v2,
+                # The parametric midpoint tells which way the arc actually
+                # goes: the OCC edge runs first -> last in its parameterization.
+                p1 = adaptor.Value(first)
+                p2 = adaptor.Value(last)
+                pm = adaptor.Value((first + last) / 2)
+                arc_slots.append(len(edges_2d))
+                arc_pts.append((
+                    c,
+                    (p1.X(), p1.Y(), p1.Z()),
+                    (p2.X(), p2.Y(), p2.Z()),
+                    (pm.X(), pm.Y(), pm.Z()),
                 ))
+                arc_r.append(circ.Radius())
+            edges_2d.append(None)
 
         else:
             # Spline, ellipse, or other curve -> tessellate
             n_points = max(20, int((last - first) * 50))
             pts = []
             for i in range(n_points + 1):
-                t = first + (last - first) * i / n_points
-                p = adaptor.Value(t)
-                u, v = _drop_axis(p.X(), p.Y(), p.Z(), axis)
-                pts.append((u * scale, v * scale))
-            edges_2d.append(Polyline2D(pts))
+                p = adaptor.Value(first + (last - first) * i / n_points)
+                pts.append((p.X(), p.Y(), p.Z()))
+            # Drop the axis and scale once for the whole polyline
+            uv = np.array(pts)[:, _AXIS_KEEP[axis]] * scale
+            edges_2d.append(Polyline2D(list(map(tuple, uv.tolist()))))
+
+    # Second pass: drop the axis, scale and compute arc angles per kind
+    keep = _AXIS_KEEP[axis]
+
+    if line_slots:
+        uv = np.array(line_pts)[..., keep] * scale
+        for i, ((u1, v1), (u2, v2)) in zip(line_slots, uv.tolist()):
+            edges_2d[i] = Line2D(u1, v1, u2, v2)
+
+    if circle_slots:
+        uv = np.array(circle_pts)[:, keep] * scale
+        r = np.array(circle_r) * scale
+        for i, (cx, cy), ri in zip(circle_slots, uv.tolist(), r.tolist()):
+            edges_2d[i] = Circle2D(cx, cy, ri)
+
+    if arc_slots:
+        # (A, 4, 2): center, start, end, midpoint
+        uv = np.array(arc_pts)[..., keep] * scale
+        r = np.array(arc_r) * scale
+        rel = uv[:, 1:] - uv[:, :1]
+        start_deg, end_deg, mid_deg = np.degrees(
+            np.arctan2(rel[..., 1], rel[..., 0])
+        ).T
+
+        # Compute CCW sweep from start to end
+        ccw_sweep = np.mod(end_deg - start_deg, 360.0)
+        ccw_sweep[ccw_sweep == 0] = 360.0
+
+        # Midpoint within the CCW sweep: CCW is correct, else CW (negative)
+        mid_from_start = np.mod(mid_deg - start_deg, 360.0)
+        sweep_deg = np.where(
+            mid_from_start <= ccw_sweep + 0.5, ccw_sweep, ccw_sweep - 360.0
+        )
+
+        for i, ((cx, cy), (u1, v1), (u2, v2), _), ri, sa, sw in zip(
+            arc_slots, uv.tolist(), r.tolist(),
+            start_deg.tolist(), sweep_deg.tolist(),
+        ):
+            edges_2d[i] = Arc2D(cx, cy, ri, sa, sw, u1, v1, u2, v2)
 
     return edges_2d
 
@@ -219,27 +247,32 @@ def extract_profile(shape: cq.Workplane, unit_to_inches: float) -> ProfileResult
     # Sort axes by extent size (smallest = extrusion/thickness direction)
     axes_sorted = sorted(extents.keys(), key=lambda a: extents[a])
 
+    # Walk the topology once; planar faces and their normals are computed
+    # once for every axis tried
+    all_faces = shape.faces().vals()
+    planar = []
+    for face in all_faces:
+        if face.geomType() != "PLANE":
+            continue
+        try:
+            normal = gp_Vec(*face.normalAt(face.Center()))
+        except Exception:
+            continue
+        planar.append((face, normal))
+    area_cache = {}
+
     for axis in axes_sorted:
         thickness = extents[axis]
         thickness_inches = thickness * unit_to_inches
         axis_vec = AXIS_VECTORS[axis]
 
         # Find planar faces whose normal is ~parallel to this axis
-        candidate_faces = []
-        for face in shape.faces().vals():
-            if face.geomType() != "PLANE":
-                continue
-            try:
-                normal = gp_Vec(*face.normalAt(face.Center()))
-            except Exception:
-                continue
-            if abs(normal.Dot(axis_vec)) > 0.999:
-                candidate_faces.append(face)
+        candidate_faces = [f for f, n in planar if abs(n.Dot(axis_vec)) > 0.999]
 
         if not candidate_faces:
             continue
 
-        best_face = max(candidate_faces, key=_face_area)
+        best_face = _largest_face(candidate_faces, area_cache)
 
         # Extract edges from outer wire and inner wires (holes)
         outer_wire = best_face.outerWire()
@@ -271,18 +304,9 @@ def extract_profile(shape: cq.Workplane, unit_to_inches: float) -> ProfileResult
     thickness_inches = extents[axis] * unit_to_inches
     axis_vec = AXIS_VECTORS[axis]
 
-    planar_faces = []
-    for face in shape.faces().vals():
-        if face.geomType() != "PLANE":
-            continue
-        try:
-            normal = gp_Vec(*face.normalAt(face.Center()))
-        except Exception:
-            continue
-        if abs(normal.Dot(axis_vec)) > 0.999:
-            planar_faces.append(face)
+    planar_faces = [f for f, n in planar if abs(n.Dot(axis_vec)) > 0.999]
 
-    best_face = max(planar_faces, key=_face_area) if planar_faces else shape.faces().vals()[0]
+    best_face = _largest_face(planar_faces, area_cache) if planar_faces else all_faces[0]
     outer_wire = best_face.outerWire()
     outer_edges = _extract_edges_from_wire(outer_wire, axis, unit_to_inches)
     inner_wires_edges = []
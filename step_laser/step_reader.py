@@ -13,6 +13,28 @@ import cadquery as cq
 MM_TO_INCHES = 1.0 / 25.4
 
 
+def limit_occ_threads() -> None:
+    """
+    Keep OCC to a single thread in this process (a pool worker).
+
+    Batch conversion already runs one file per core in a process pool.
+    Left alone, OCC's parallel algorithms (TBB, or its own OSD_ThreadPool)
+    would start a thread per core inside every worker and oversubscribe
+    the machine. The alternative, multi-threaded OCC with roughly a quarter
+    as many workers, only pays off for a few very large parts.
+    """
+    try:
+        from OCP.OSD import OSD_Parallel, OSD_ThreadPool
+    except ImportError:
+        return
+    # Route OSD_Parallel through OCC's own pool instead of TBB, then size
+    # that pool to one thread; older OCP builds may lack either binding
+    if hasattr(OSD_Parallel, "SetUseOcctThreads_s"):
+        OSD_Parallel.SetUseOcctThreads_s(True)
+    if hasattr(OSD_ThreadPool, "DefaultPool_s"):
+        OSD_ThreadPool.DefaultPool_s().Init(1)
+
+
 def load_step(filepath: Path):
     """
     Load a STEP file and return (cq_shape, unit_to_inches).